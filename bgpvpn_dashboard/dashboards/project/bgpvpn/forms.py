@@ -13,7 +13,6 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 #
-import collections
 import logging
 
 from django.urls import reverse_lazy
@@ -71,8 +70,7 @@ class CommonData(forms.SelfHandlingForm):
         if 'keyOrder' in self.fields:
             self.fields.keyOrder = self.fields_order
         else:
-            self.fields = collections.OrderedDict(
-                (k, self.fields[k]) for k in self.fields_order)
+            self.fields = {k: self.fields[k] for k in self.fields_order}
 
     @staticmethod
     def _del_attributes(attributes, data):
@@ -89,16 +87,14 @@ class CommonData(forms.SelfHandlingForm):
                 params[key] = bgpvpn_common.format_rt(data.pop(key, None))
 
         # Process VNI
-        if data.get('vni'):
-            params['vni'] = data.pop('vni')
-        elif 'vni' in data:
-            data.pop('vni')
+        vni = data.pop('vni', None)
+        if vni:
+            params['vni'] = vni
 
         # Process local_pref
-        if data.get('local_pref') is not None:
-            params['local_pref'] = data.pop('local_pref')
-        elif 'local_pref' in data:
-            data.pop('local_pref')
+        local_pref = data.pop('local_pref', None)
+        if local_pref is not None:
+            params['local_pref'] = local_pref
 
         params.update(data)
         error_msg = _('Something went wrong with BGPVPN %s') % data['name']
@@ -183,8 +179,8 @@ class CreateNetworkAssociation(forms.SelfHandlingForm):
         try:
             networks = api.neutron.network_list_for_tenant(request, tenant_id)
             if networks:
-                choices = [('', _("Choose a network"))] + [(n.id, n) for n in
-                                                           networks]
+                choices = [('', _("Choose a network")),
+                           *((n.id, n) for n in networks)]
                 self.fields['network_resource'].choices = choices
             else:
                 self.fields['network_resource'].choices = [('',
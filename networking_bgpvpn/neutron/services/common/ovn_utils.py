@@ -25,6 +25,41 @@ from networking_bgpvpn.neutron.services.common import constants
 
 LOG = logging.getLogger(__name__)
 
+# All OVN external_ids keys used for EVPN configuration, in a fixed order
+_EVPN_EXTERNAL_IDS_KEYS_ORDERED = (
+    constants.OVN_EVPN_TYPE_EXT_ID_KEY,
+    constants.OVN_EVPN_VNI_EXT_ID_KEY,
+    constants.OVN_EVPN_AS_EXT_ID_KEY,
+    constants.OVN_EVPN_RT_EXT_ID_KEY,
+    constants.OVN_EVPN_IRT_EXT_ID_KEY,
+    constants.OVN_EVPN_ERT_EXT_ID_KEY,
+    constants.OVN_EVPN_RD_EXT_ID_KEY,
+    constants.OVN_EVPN_LOCAL_PREF_EXT_ID_KEY,
+)
+
+# The same keys as a set, for intersections with a row's external_ids
+EVPN_EXTERNAL_IDS_KEYS = frozenset(_EVPN_EXTERNAL_IDS_KEYS_ORDERED)
+
+_RECOMMENDED_AGENT_CONFIG = """
+# Recommended ovn-bgp-agent.conf for BGPVPN integration
+
+[DEFAULT]
+driver = ovn_evpn_driver
+exposing_method = vrf
+evpn_local_ip = <VTEP_IP>
+bgp_AS = <YOUR_AS>
+bgp_router_id = <ROUTER_ID>
+
+[ovn]
+ovn_nb_connection = tcp:<NB_IP>:6641
+ovn_sb_connection = tcp:<SB_IP>:6642
+"""
+
+_COMPATIBILITY_RESULT = (True, _RECOMMENDED_AGENT_CONFIG)
+
+# The compatibility notice is only logged on the first check
+_compatibility_logged = False
+
 
 def verify_ovn_bgp_agent_compatibility():
     """Verify OVN BGP Agent is properly configured
@@ -35,10 +70,12 @@ def verify_ovn_bgp_agent_compatibility():
     Returns:
         tuple: (bool, str) - (is_compatible, message)
     """
-    recommendations = get_recommended_agent_config()
-    LOG.info("OVN BGPVPN integration requires OVN BGP Agent with "
-             "driver=ovn_evpn_driver. See documentation for details.")
-    return True, recommendations
+    global _compatibility_logged
+    if not _compatibility_logged:
+        LOG.info("OVN BGPVPN integration requires OVN BGP Agent with "
+                 "driver=ovn_evpn_driver. See documentation for details.")
+        _compatibility_logged = True
+    return _COMPATIBILITY_RESULT
 
 
 def get_recommended_agent_config():
@@ -46,37 +83,15 @@ def get_recommended_agent_config():
 
     This is generic advice, not driver-specific.
     """
-    return """
-# Recommended ovn-bgp-agent.conf for BGPVPN integration
-
-[DEFAULT]
-driver = ovn_evpn_driver
-exposing_method = vrf
-evpn_local_ip = <VTEP_IP>
-bgp_AS = <YOUR_AS>
-bgp_router_id = <ROUTER_ID>
-
-[ovn]
-ovn_nb_connection = tcp:<NB_IP>:6641
-ovn_sb_connection = tcp:<SB_IP>:6642
-"""
+    return _RECOMMENDED_AGENT_CONFIG
 
 
 def get_evpn_external_ids_keys():
-    """Get list of all EVPN-related external_ids keys
+    """Get all EVPN-related external_ids keys
 
     Useful for cleanup or migration operations.
 
     Returns:
-        list: All OVN external_ids keys used for EVPN configuration
+        tuple: All OVN external_ids keys used for EVPN configuration
     """
-    return [
-        constants.OVN_EVPN_TYPE_EXT_ID_KEY,
-        constants.OVN_EVPN_VNI_EXT_ID_KEY,
-        constants.OVN_EVPN_AS_EXT_ID_KEY,
-        constants.OVN_EVPN_RT_EXT_ID_KEY,
-        constants.OVN_EVPN_IRT_EXT_ID_KEY,
-        constants.OVN_EVPN_ERT_EXT_ID_KEY,
-        constants.OVN_EVPN_RD_EXT_ID_KEY,
-        constants.OVN_EVPN_LOCAL_PREF_EXT_ID_KEY,
-    ]
\ No newline at end of file
+    return _EVPN_EXTERNAL_IDS_KEYS_ORDERED
@@ -19,19 +19,84 @@ This module handles all interactions with the OVN Northbound and Southbound
 databases, writing EVPN configuration into external_ids.
 """
 
-import json
+from neutron.plugins.ml2.drivers.ovn.mech_driver import mech_driver
 
 from neutron_lib.api.definitions import bgpvpn_routes_control as bgpvpn_rc_def
 from neutron_lib.api.definitions import bgpvpn_vni as bgpvpn_vni_def
 from neutron_lib.plugins import directory
 
 from oslo_log import log as logging
+from oslo_serialization import jsonutils
 
 from networking_bgpvpn.neutron.services.common import constants as svc_const
 from networking_bgpvpn.neutron.services.common import ovn_utils
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = jsonutils.loads
+
 LOG = logging.getLogger(__name__)
 
+# Module-local bindings of the EVPN external_ids keys and BGPVPN attribute
+# names used when building and parsing external_ids
+_K_TYPE = svc_const.OVN_EVPN_TYPE_EXT_ID_KEY
+_K_VNI = svc_const.OVN_EVPN_VNI_EXT_ID_KEY
+_K_AS = svc_const.OVN_EVPN_AS_EXT_ID_KEY
+_K_RT = svc_const.OVN_EVPN_RT_EXT_ID_KEY
+_K_IRT = svc_const.OVN_EVPN_IRT_EXT_ID_KEY
+_K_ERT = svc_const.OVN_EVPN_ERT_EXT_ID_KEY
+_K_RD = svc_const.OVN_EVPN_RD_EXT_ID_KEY
+_K_LOCAL_PREF = svc_const.OVN_EVPN_LOCAL_PREF_EXT_ID_KEY
+_VNI = bgpvpn_vni_def.VNI
+_LOCAL_PREF = bgpvpn_rc_def.LOCAL_PREF_KEY
+
+
+# Name prefixes of the OVN resources created by ML2/OVN for Neutron
+# networks and router interface ports
+_LS_NAME_PREFIX = 'neutron-'
+_LRP_NAME_PREFIX = 'lrp-'
+
+
+def _encode_rtrd_list(values):
+    """Encode route targets/distinguishers as a JSON array string
+
+    The API validates these values against RTRD_REGEX (digits, dots and
+    colons only), so they never need escaping and joining them gives the
+    same string as json.dumps() without going through the JSON encoder.
+    The OVN BGP Agent keeps parsing the value as JSON.
+    """
+    if not values:
+        return '[]'
+    return '["' + '", "'.join(values) + '"]'
+
+
+def _changed_external_ids(current_external_ids, evpn_external_ids):
+    """Return the EVPN external_ids whose value differs from the row's"""
+    return {key: value for key, value in evpn_external_ids.items()
+            if current_external_ids.get(key) != value}
+
+
+# (BGPVPN attribute, external_ids key, encoder) of the optional list
+# attributes copied to external_ids when set
+_EVPN_LIST_FIELDS = (
+    ('route_targets', _K_RT, _encode_rtrd_list),
+    ('import_targets', _K_IRT, _encode_rtrd_list),
+    ('export_targets', _K_ERT, _encode_rtrd_list),
+    ('route_distinguishers', _K_RD, _encode_rtrd_list),
+)
+
+# (config name, external_ids key, parser) of the optional EVPN config read
+# back from external_ids
+_EVPN_READ_FIELDS = (
+    ('route_targets', _K_RT, _json_loads),
+    ('import_targets', _K_IRT, _json_loads),
+    ('export_targets', _K_ERT, _json_loads),
+    ('route_distinguishers', _K_RD, _json_loads),
+    ('bgp_as', _K_AS, str),
+    ('local_pref', _K_LOCAL_PREF, int),
+)
+
 
 class OVNClient:
     """Client for interacting with OVN databases"""
@@ -40,46 +105,45 @@ class OVNClient:
         self._ovn_nb_idl = None
         self._ovn_sb_idl = None
 
+    @staticmethod
+    def _resolve_ovn_driver():
+        """Resolve the OVN NB/SB IDLs of the ML2/OVN mechanism driver
+
+        Returns:
+            tuple: (nb_ovn, sb_ovn) IDL instances
+        """
+        plugin = directory.get_plugin()
+        if not plugin:
+            raise RuntimeError("Neutron core plugin not loaded")
+
+        if not hasattr(plugin, 'mechanism_manager'):
+            raise RuntimeError("Plugin does not have mechanism_manager")
+
+        ovn_driver = next(
+            (driver.obj
+             for driver in plugin.mechanism_manager.mech_drivers.values()
+             if isinstance(driver.obj, mech_driver.OVNMechanismDriver)),
+            None)
+        if ovn_driver is None:
+            raise RuntimeError(
+                "OVN mechanism driver not found. "
+                "Ensure ML2/OVN is configured in mechanism_drivers")
+        if ovn_driver.nb_ovn is None:
+            raise RuntimeError("OVN mechanism driver IDLs not initialized")
+
+        LOG.info("Found OVN mechanism driver %s: NB=%s, SB=%s",
+                 ovn_driver.__class__.__name__,
+                 type(ovn_driver.nb_ovn), type(ovn_driver.sb_ovn))
+        return ovn_driver.nb_ovn, ovn_driver.sb_ovn
+
     @property
     def _nb_idl(self):
-        """Lazy initialization of OVN NB IDL connection"""
-        if self._ovn_nb_idl is None:
-            LOG.info("Initializing OVN NB IDL connection")
-
-            # Get ML2 plugin
-            plugin = directory.get_plugin()
-            if not plugin:
-                raise RuntimeError("Neutron core plugin not loaded")
-
-            LOG.debug("Got plugin: %s", type(plugin))
-
-            # Get OVN mechanism driver
-            if not hasattr(plugin, 'mechanism_manager'):
-                raise RuntimeError("Plugin does not have mechanism_manager")
-
-            ovn_driver = None
-            for name, driver in plugin.mechanism_manager.mech_drivers.items():
-                LOG.debug("Checking mechanism driver: %s", name)
-                # Check if this is OVN driver
-                if hasattr(driver.obj, 'nb_ovn') and hasattr(driver.obj, 'sb_ovn'):
-                    driver_class = driver.obj.__class__.__name__
-                    if 'OVN' in driver_class:
-                        ovn_driver = driver.obj
-                        LOG.info("Found OVN mechanism driver: %s (class: %s)",
-                                 name, driver_class)
-                        break
-
-            if not ovn_driver:
-                raise RuntimeError(
-                    "OVN mechanism driver not found. "
-                    "Ensure ML2/OVN is configured in mechanism_drivers")
-
-            # Use the driver's nb_ovn and sb_ovn IDL
-            self._ovn_nb_idl = ovn_driver.nb_ovn
-            self._ovn_sb_idl = ovn_driver.sb_ovn
-            LOG.info("Successfully got OVN IDLs: NB=%s, SB=%s",
-                     type(self._ovn_nb_idl), type(self._ovn_sb_idl))
+        """Lazy initialization of OVN NB IDL connection
 
+        The IDLs are resolved once per client, on first use.
+        """
+        if self._ovn_nb_idl is None:
+            self._ovn_nb_idl, self._ovn_sb_idl = self._resolve_ovn_driver()
         return self._ovn_nb_idl
 
     @property
@@ -90,6 +154,14 @@ class OVNClient:
             _ = self._nb_idl
         return self._ovn_sb_idl
 
+    def nb_transaction(self):
+        """Open an OVN NB transaction
+
+        The transaction can be passed as txn to the Logical_Switch update
+        and clear methods to commit several of them at once.
+        """
+        return self._nb_idl.transaction(check_error=True)
+
     # =========================================================================
     # Logical_Switch operations (NB)
     # =========================================================================
@@ -104,14 +176,35 @@ class OVNClient:
         Returns:
             OVN Logical_Switch row or None
         """
-        ls_name = f"neutron-{network_id}"
-        try:
-            return self._nb_idl.ls_get(ls_name).execute(check_error=True)
-        except Exception as e:
-            LOG.warning("Failed to get Logical_Switch %s: %s", ls_name, e)
-            return None
+        ls_name = _LS_NAME_PREFIX + network_id
+        # Logical_Switch.name is part of the NB API lookup table, which
+        # ovsdbapp indexes, so this is an in-memory indexed lookup. A missing
+        # Logical_Switch is expected (e.g. during network create/delete
+        # races) and returns None; IDL errors are raised to the caller.
+        ls = self._nb_idl.lookup('Logical_Switch', ls_name, default=None)
+        if ls is None:
+            LOG.debug("Logical_Switch %s not found", ls_name)
+        return ls
+
+    def get_logical_switches(self, context, network_ids):
+        """Get OVN Logical_Switches for several Neutron networks
+
+        Args:
+            context: Neutron context
+            network_ids: UUIDs of Neutron networks
 
-    def _build_evpn_external_ids(self, bgpvpn):
+        Returns:
+            dict: network_id -> Logical_Switch row, for networks that have
+                one
+        """
+        logical_switches = {}
+        for network_id in network_ids:
+            ls = self._get_logical_switch(context, network_id)
+            if ls is not None:
+                logical_switches[network_id] = ls
+        return logical_switches
+
+    def build_evpn_external_ids(self, bgpvpn):
         """Build external_ids dictionary for EVPN configuration
 
         Args:
@@ -120,75 +213,82 @@ class OVNClient:
         Returns:
             dict: external_ids to set on OVN resources
         """
-        external_ids = {}
-
         # Required fields
-        external_ids[svc_const.OVN_EVPN_TYPE_EXT_ID_KEY] = bgpvpn['type']
-        external_ids[svc_const.OVN_EVPN_VNI_EXT_ID_KEY] = str(
-            bgpvpn.get(bgpvpn_vni_def.VNI))
+        external_ids = {
+            _K_TYPE: bgpvpn['type'],
+            _K_VNI: str(bgpvpn.get(_VNI)),
+        }
+
+        # Route targets and distinguishers (stored as JSON arrays)
+        for attr, key, encode in _EVPN_LIST_FIELDS:
+            values = bgpvpn.get(attr)
+            if values:
+                external_ids[key] = encode(values)
 
         # BGP AS (extracted from route targets)
-        route_targets = bgpvpn.get('route_targets', [])
+        route_targets = bgpvpn.get('route_targets')
         if route_targets and ':' in route_targets[0]:
-            bgp_as = route_targets[0].split(':')[0]
-            external_ids[svc_const.OVN_EVPN_AS_EXT_ID_KEY] = bgp_as
-
-        # Route targets (stored as JSON array)
-        if route_targets:
-            external_ids[svc_const.OVN_EVPN_RT_EXT_ID_KEY] = json.dumps(
-                route_targets)
-
-        import_targets = bgpvpn.get('import_targets', [])
-        if import_targets:
-            external_ids[svc_const.OVN_EVPN_IRT_EXT_ID_KEY] = json.dumps(
-                import_targets)
-
-        export_targets = bgpvpn.get('export_targets', [])
-        if export_targets:
-            external_ids[svc_const.OVN_EVPN_ERT_EXT_ID_KEY] = json.dumps(
-                export_targets)
-
-        # Route distinguishers
-        route_distinguishers = bgpvpn.get('route_distinguishers', [])
-        if route_distinguishers:
-            external_ids[svc_const.OVN_EVPN_RD_EXT_ID_KEY] = json.dumps(
-                route_distinguishers)
+            external_ids[_K_AS] = route_targets[0].split(':')[0]
 
         # Local preference
-        local_pref = bgpvpn.get(bgpvpn_rc_def.LOCAL_PREF_KEY)
+        local_pref = bgpvpn.get(_LOCAL_PREF)
         if local_pref is not None:
-            external_ids[svc_const.OVN_EVPN_LOCAL_PREF_EXT_ID_KEY] = str(
-                local_pref)
+            external_ids[_K_LOCAL_PREF] = str(local_pref)
 
         LOG.debug("Built EVPN external_ids: %s", external_ids)
         return external_ids
 
-    def update_logical_switch_evpn_config(self, context, network_id, bgpvpn):
+    def update_logical_switch_evpn_config(self, context, network_id, bgpvpn,
+                                          evpn_external_ids=None, txn=None,
+                                          ls=None):
         """Write EVPN configuration to OVN Logical_Switch
 
         Args:
             context: Neutron context
             network_id: UUID of Neutron network
             bgpvpn: BGPVPN dict with full configuration
+            evpn_external_ids: external_ids from build_evpn_external_ids(),
+                built from bgpvpn when not given
+            txn: NB transaction from nb_transaction() to add the update
+                to, the update is committed on its own when not given
+            ls: Logical_Switch row of the network, e.g. from
+                get_logical_switches(), looked up when not given
         """
-        ls = self._get_logical_switch(context, network_id)
+        if ls is None:
+            ls = self._get_logical_switch(context, network_id)
         if not ls:
             LOG.error("Cannot update EVPN config: Logical_Switch not found "
                       "for network %s", network_id)
             return
 
-        evpn_external_ids = self._build_evpn_external_ids(bgpvpn)
+        if evpn_external_ids is None:
+            evpn_external_ids = self.build_evpn_external_ids(bgpvpn)
+
+        # Only write the keys whose value changed, nothing at all if the
+        # Logical_Switch is already up to date
+        changed_external_ids = _changed_external_ids(ls.external_ids,
+                                                     evpn_external_ids)
+        if not changed_external_ids:
+            LOG.debug("EVPN config for network %s is up to date",
+                      network_id)
+            return
 
         LOG.info("Updating EVPN config for network %s (LS=%s): type=%s, vni=%s",
                  network_id, ls.name, bgpvpn['type'],
-                 bgpvpn.get(bgpvpn_vni_def.VNI))
+                 bgpvpn.get(_VNI))
+
+        # db_set merges the map into external_ids, so all EVPN keys go out
+        # as a single mutation and other keys are preserved
+        nb = self._nb_idl
+        command = nb.db_set(
+            'Logical_Switch', ls.uuid, ('external_ids', changed_external_ids))
+        if txn is not None:
+            txn.add(command)
+            return
 
         try:
-            with self._nb_idl.transaction(check_error=True) as txn:
-                for key, value in evpn_external_ids.items():
-                    txn.add(self._nb_idl.db_set(
-                        'Logical_Switch', ls.uuid,
-                        ('external_ids', {key: value})))
+            with nb.transaction(check_error=True) as nb_txn:
+                nb_txn.add(command)
 
             LOG.info("Successfully updated EVPN config for network %s",
                      network_id)
@@ -198,30 +298,46 @@ class OVNClient:
                       network_id, e)
             raise
 
-    def clear_logical_switch_evpn_config(self, context, network_id):
+    def clear_logical_switch_evpn_config(self, context, network_id,
+                                         txn=None, ls=None):
         """Remove EVPN configuration from OVN Logical_Switch
 
         Args:
             context: Neutron context
             network_id: UUID of Neutron network
+            txn: NB transaction from nb_transaction() to add the removal
+                to, the removal is committed on its own when not given
+            ls: Logical_Switch row of the network, e.g. from
+                get_logical_switches(), looked up when not given
         """
-        ls = self._get_logical_switch(context, network_id)
+        if ls is None:
+            ls = self._get_logical_switch(context, network_id)
         if not ls:
             LOG.warning("Cannot clear EVPN config: Logical_Switch not found "
                         "for network %s", network_id)
             return
 
+        present_keys = (ls.external_ids.keys() &
+                        ovn_utils.EVPN_EXTERNAL_IDS_KEYS)
+        if not present_keys:
+            LOG.debug("No EVPN config to clear for network %s (LS=%s)",
+                      network_id, ls.name)
+            return
+
         LOG.info("Clearing EVPN config for network %s (LS=%s)",
                  network_id, ls.name)
 
-        evpn_keys = ovn_utils.get_evpn_external_ids_keys()
+        nb = self._nb_idl
+        command = nb.db_remove(
+            'Logical_Switch', ls.uuid,
+            'external_ids', *sorted(present_keys), if_exists=True)
+        if txn is not None:
+            txn.add(command)
+            return
 
         try:
-            with self._nb_idl.transaction(check_error=True) as txn:
-                for key in evpn_keys:
-                    txn.add(self._nb_idl.db_remove(
-                        'Logical_Switch', ls.uuid,
-                        'external_ids', key, if_exists=True))
+            with nb.transaction(check_error=True) as nb_txn:
+                nb_txn.add(command)
 
             LOG.info("Successfully cleared EVPN config for network %s",
                      network_id)
@@ -247,39 +363,19 @@ class OVNClient:
 
         external_ids = ls.external_ids
 
-        if svc_const.OVN_EVPN_VNI_EXT_ID_KEY not in external_ids:
+        if _K_VNI not in external_ids:
             return None
 
         config = {
-            'type': external_ids.get(
-                svc_const.OVN_EVPN_TYPE_EXT_ID_KEY,
-                svc_const.BGPVPN_L3),
-            'vni': int(external_ids.get(svc_const.OVN_EVPN_VNI_EXT_ID_KEY, 0)),
+            'type': external_ids.get(_K_TYPE, svc_const.BGPVPN_L3),
+            'vni': int(external_ids.get(_K_VNI, 0)),
         }
 
-        # Parse JSON fields
-        if svc_const.OVN_EVPN_RT_EXT_ID_KEY in external_ids:
-            config['route_targets'] = json.loads(
-                external_ids[svc_const.OVN_EVPN_RT_EXT_ID_KEY])
-
-        if svc_const.OVN_EVPN_IRT_EXT_ID_KEY in external_ids:
-            config['import_targets'] = json.loads(
-                external_ids[svc_const.OVN_EVPN_IRT_EXT_ID_KEY])
-
-        if svc_const.OVN_EVPN_ERT_EXT_ID_KEY in external_ids:
-            config['export_targets'] = json.loads(
-                external_ids[svc_const.OVN_EVPN_ERT_EXT_ID_KEY])
-
-        if svc_const.OVN_EVPN_RD_EXT_ID_KEY in external_ids:
-            config['route_distinguishers'] = json.loads(
-                external_ids[svc_const.OVN_EVPN_RD_EXT_ID_KEY])
-
-        if svc_const.OVN_EVPN_AS_EXT_ID_KEY in external_ids:
-            config['bgp_as'] = external_ids[svc_const.OVN_EVPN_AS_EXT_ID_KEY]
-
-        if svc_const.OVN_EVPN_LOCAL_PREF_EXT_ID_KEY in external_ids:
-            config['local_pref'] = int(
-                external_ids[svc_const.OVN_EVPN_LOCAL_PREF_EXT_ID_KEY])
+        # Optional fields, JSON ones included
+        for name, key, parse in _EVPN_READ_FIELDS:
+            value = external_ids.get(key)
+            if value is not None:
+                config[name] = parse(value)
 
         return config
 
@@ -298,21 +394,20 @@ class OVNClient:
             OVN Port_Binding row or None
         """
         # Router interface ports have 'lrp-' prefix
-        logical_port = f"lrp-{port_id}"
-        try:
-            # Query SB database
-            for pb in self._sb_idl.db_list_rows('Port_Binding').execute():
-                if pb.logical_port == logical_port:
-                    return pb
+        logical_port = _LRP_NAME_PREFIX + port_id
+        # Let the IDL match on logical_port (indexed when available)
+        # instead of scanning every Port_Binding row
+        rows = self._sb_idl.db_find_rows(
+            'Port_Binding',
+            ('logical_port', '=', logical_port)).execute(check_error=True)
+        pb = next(iter(rows), None)
+        if pb is None:
             LOG.warning("Port_Binding not found for port %s (lrp=%s)",
                         port_id, logical_port)
-            return None
-        except Exception as e:
-            LOG.error("Failed to get Port_Binding for port %s: %s",
-                      port_id, e)
-            return None
+        return pb
 
-    def update_port_binding_evpn_config(self, context, port_id, bgpvpn):
+    def update_port_binding_evpn_config(self, context, port_id, bgpvpn,
+                                        evpn_external_ids=None):
         """Write EVPN configuration to OVN Port_Binding external_ids
 
         The OVN BGP Agent monitors Port_Binding external_ids, particularly
@@ -322,6 +417,8 @@ class OVNClient:
             context: Neutron context
             port_id: UUID of Neutron port
             bgpvpn: BGPVPN dict with full configuration
+            evpn_external_ids: external_ids from build_evpn_external_ids(),
+                built from bgpvpn when not given
         """
         pb = self._get_port_binding(context, port_id)
         if not pb:
@@ -329,17 +426,25 @@ class OVNClient:
                         "Port_Binding not found for port %s", port_id)
             return
 
-        evpn_external_ids = self._build_evpn_external_ids(bgpvpn)
+        if evpn_external_ids is None:
+            evpn_external_ids = self.build_evpn_external_ids(bgpvpn)
+
+        changed_external_ids = _changed_external_ids(pb.external_ids,
+                                                     evpn_external_ids)
+        if not changed_external_ids:
+            LOG.debug("Port_Binding EVPN config for port %s is up to date",
+                      port_id)
+            return
 
         LOG.info("Updating Port_Binding EVPN config for port %s (logical_port=%s)",
                  port_id, pb.logical_port)
 
         try:
-            with self._sb_idl.transaction(check_error=True) as txn:
-                for key, value in evpn_external_ids.items():
-                    txn.add(self._sb_idl.db_set(
-                        'Port_Binding', pb.uuid,
-                        ('external_ids', {key: value})))
+            sb = self._sb_idl
+            with sb.transaction(check_error=True) as txn:
+                txn.add(sb.db_set(
+                    'Port_Binding', pb.uuid,
+                    ('external_ids', changed_external_ids)))
 
             LOG.info("Successfully updated Port_Binding EVPN config for port %s",
                      port_id)
@@ -349,6 +454,81 @@ class OVNClient:
                       port_id, e)
             raise
 
+    def _get_port_bindings(self, context, port_ids):
+        """Get OVN Port_Bindings for several Neutron ports
+
+        Args:
+            context: Neutron context
+            port_ids: UUIDs of Neutron ports
+
+        Returns:
+            dict: port_id -> Port_Binding row, for ports that have one and
+                could be looked up
+        """
+        port_bindings = {}
+        for port_id in port_ids:
+            # A failed lookup only skips its own port, not the whole batch
+            try:
+                pb = self._get_port_binding(context, port_id)
+            except Exception as e:
+                LOG.error("Failed to get Port_Binding for port %s: %s",
+                          port_id, e)
+                continue
+            if pb:
+                port_bindings[port_id] = pb
+        return port_bindings
+
+    def update_port_bindings_evpn_config_bulk(self, context, port_ids,
+                                              bgpvpn, evpn_external_ids=None):
+        """Write EVPN configuration to several OVN Port_Bindings
+
+        All Port_Bindings are updated in a single SB transaction.
+
+        Args:
+            context: Neutron context
+            port_ids: UUIDs of Neutron ports
+            bgpvpn: BGPVPN dict with full configuration
+            evpn_external_ids: external_ids from build_evpn_external_ids(),
+                built from bgpvpn when not given
+        """
+        port_bindings = self._get_port_bindings(context, port_ids)
+        if not port_bindings:
+            return
+
+        if evpn_external_ids is None:
+            evpn_external_ids = self.build_evpn_external_ids(bgpvpn)
+
+        # Port_Binding -> changed keys, for the rows that are not up to date
+        updates = {}
+        for port_id, pb in port_bindings.items():
+            changed_external_ids = _changed_external_ids(pb.external_ids,
+                                                         evpn_external_ids)
+            if changed_external_ids:
+                updates[port_id] = (pb, changed_external_ids)
+        if not updates:
+            LOG.debug("Port_Binding EVPN config for ports %s is up to date",
+                      list(port_bindings))
+            return
+
+        LOG.info("Updating Port_Binding EVPN config for ports %s",
+                 list(updates))
+
+        try:
+            sb = self._sb_idl
+            with sb.transaction(check_error=True) as txn:
+                for pb, changed_external_ids in updates.values():
+                    txn.add(sb.db_set(
+                        'Port_Binding', pb.uuid,
+                        ('external_ids', changed_external_ids)))
+
+            LOG.info("Successfully updated Port_Binding EVPN config for "
+                     "%d ports", len(updates))
+
+        except Exception as e:
+            LOG.error("Failed to update Port_Binding EVPN config for "
+                      "ports %s: %s", list(updates), e)
+            raise
+
     def clear_port_binding_evpn_config(self, context, port_id):
         """Remove EVPN configuration from OVN Port_Binding
 
@@ -362,17 +542,22 @@ class OVNClient:
                         "Port_Binding not found for port %s", port_id)
             return
 
+        present_keys = (pb.external_ids.keys() &
+                        ovn_utils.EVPN_EXTERNAL_IDS_KEYS)
+        if not present_keys:
+            LOG.debug("No Port_Binding EVPN config to clear for port %s "
+                      "(logical_port=%s)", port_id, pb.logical_port)
+            return
+
         LOG.info("Clearing Port_Binding EVPN config for port %s (logical_port=%s)",
                  port_id, pb.logical_port)
 
-        evpn_keys = ovn_utils.get_evpn_external_ids_keys()
-
         try:
-            with self._sb_idl.transaction(check_error=True) as txn:
-                for key in evpn_keys:
-                    txn.add(self._sb_idl.db_remove(
-                        'Port_Binding', pb.uuid,
-                        'external_ids', key, if_exists=True))
+            sb = self._sb_idl
+            with sb.transaction(check_error=True) as txn:
+                txn.add(sb.db_remove(
+                    'Port_Binding', pb.uuid,
+                    'external_ids', *sorted(present_keys), if_exists=True))
 
             LOG.info("Successfully cleared Port_Binding EVPN config for port %s",
                      port_id)
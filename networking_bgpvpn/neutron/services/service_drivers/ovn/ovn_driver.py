@@ -33,6 +33,7 @@ from neutron_lib.callbacks import events
 from neutron_lib.callbacks import registry
 from neutron_lib.callbacks import resources
 from neutron_lib import constants as const
+from neutron_lib.plugins import constants as plugin_constants
 from neutron_lib.plugins import directory
 
 from oslo_log import helpers as log_helpers
@@ -46,6 +47,21 @@ LOG = logging.getLogger(__name__)
 
 OVN_DRIVER_NAME = "ovn"
 
+SUPPORTED_BGPVPN_TYPES = frozenset((bgpvpn_const.BGPVPN_L2,
+                                    bgpvpn_const.BGPVPN_L3))
+
+# BGPVPN attributes written to OVN external_ids, a BGPVPN update changing
+# none of them (name, description, ...) needs no OVN update
+OVN_RELEVANT_ATTRIBUTES = frozenset((
+    'type',
+    bgpvpn_vni_def.VNI,
+    'route_targets',
+    'import_targets',
+    'export_targets',
+    'route_distinguishers',
+    bgpvpn_rc_def.LOCAL_PREF_KEY,
+))
+
 
 def _log_callback_processing_exception(resource, event, trigger, payload, e):
     LOG.exception("Error during notification processing "
@@ -74,6 +90,8 @@ class OVNBGPVPNDriver(driver_api.BGPVPNDriverRC):
     def __init__(self, service_plugin):
         super().__init__(service_plugin)
         self._ovn_client = None
+        self._core_plugin = None
+        self._l3_plugin = None
 
     @property
     def ovn_client(self):
@@ -84,25 +102,33 @@ class OVNBGPVPNDriver(driver_api.BGPVPNDriverRC):
             self._ovn_client = ovn_client.OVNClient()
         return self._ovn_client
 
-    def _validate_bgpvpn_type(self, bgpvpn):
-        """Validate BGPVPN type is supported"""
-        if bgpvpn['type'] not in [bgpvpn_const.BGPVPN_L2,
-                                  bgpvpn_const.BGPVPN_L3]:
+    @property
+    def core_plugin(self):
+        if self._core_plugin is None:
+            self._core_plugin = directory.get_plugin()
+        return self._core_plugin
+
+    @property
+    def l3_plugin(self):
+        if self._l3_plugin is None:
+            self._l3_plugin = directory.get_plugin(plugin_constants.L3)
+        return self._l3_plugin
+
+    def _common_precommit_checks(self, bgpvpn):
+        """Common validation for BGPVPN operations
+
+        The BGPVPN type must be supported and a VNI must be provided.
+        """
+        bgpvpn_type = bgpvpn['type']
+        if bgpvpn_type not in SUPPORTED_BGPVPN_TYPES:
             raise bgpvpn_ext.BGPVPNTypeNotSupported(
                 driver=OVN_DRIVER_NAME,
-                type=bgpvpn['type'])
+                type=bgpvpn_type)
 
-    def _validate_vni_required(self, bgpvpn):
-        """Validate VNI is provided for OVN driver"""
         if not bgpvpn.get(bgpvpn_vni_def.VNI):
             raise bgpvpn_ext.BGPVPNDriverError(
                 method="OVN driver requires VNI to be specified")
 
-    def _common_precommit_checks(self, bgpvpn):
-        """Common validation for BGPVPN operations"""
-        self._validate_bgpvpn_type(bgpvpn)
-        self._validate_vni_required(bgpvpn)
-
     # =========================================================================
     # BGPVPN CRUD operations
     # =========================================================================
@@ -128,41 +154,90 @@ class OVNBGPVPNDriver(driver_api.BGPVPNDriverRC):
         (added_keys, removed_keys, changed_keys) = (
             utils.get_bgpvpn_differences(new_bgpvpn, old_bgpvpn))
 
-        # Attributes that don't require OVN update
-        ATTRIBUTES_TO_IGNORE = {'name', 'tenant_id', 'project_id'}
         moving_keys = added_keys | removed_keys | changed_keys
-
-        if not (moving_keys - ATTRIBUTES_TO_IGNORE):
+        relevant_keys = moving_keys & OVN_RELEVANT_ATTRIBUTES
+        if not relevant_keys:
+            LOG.debug("BGPVPN %s update does not change EVPN config, "
+                      "changed attributes: %s", new_bgpvpn['id'], moving_keys)
             return
 
         LOG.info("Updating BGPVPN %s, changed attributes: %s",
-                 new_bgpvpn['id'], moving_keys - ATTRIBUTES_TO_IGNORE)
-
-        # Update all associated networks
-        for network_id in new_bgpvpn.get('networks', []):
-            self._update_network_evpn_config(context, network_id, new_bgpvpn)
-
-        # Update all associated routers
-        for router_id in new_bgpvpn.get('routers', []):
-            self._update_router_evpn_config(context, router_id, new_bgpvpn)
+                 new_bgpvpn['id'], relevant_keys)
+
+        # Same external_ids for every associated resource, build them once
+        evpn_external_ids = self.ovn_client.build_evpn_external_ids(
+            new_bgpvpn)
+
+        # Update all networks associated directly or via a router, each
+        # one once, with the ports of all routers fetched in one query
+        routers_ports = self._get_router_ports_bulk(
+            context, new_bgpvpn.get('routers', []))
+        network_ids = dict.fromkeys(new_bgpvpn.get('networks', []))
+        network_ids.update(self._get_router_network_ids(routers_ports))
+        if network_ids:
+            # All Logical_Switch updates are committed in one NB
+            # transaction, then the router ports of each network (SB)
+            logical_switches = self._get_logical_switches(context,
+                                                          network_ids)
+            if logical_switches:
+                try:
+                    with self.ovn_client.nb_transaction() as txn:
+                        for network_id, ls in logical_switches.items():
+                            self.ovn_client.update_logical_switch_evpn_config(
+                                context, network_id, new_bgpvpn,
+                                evpn_external_ids=evpn_external_ids,
+                                txn=txn, ls=ls)
+                except Exception as e:
+                    LOG.error("Failed to update EVPN config of BGPVPN %s "
+                              "for networks %s: %s", new_bgpvpn['id'],
+                              list(logical_switches), e)
+                    raise
+            for network_id in network_ids:
+                self._update_router_ports_evpn_config(
+                    context, network_id, new_bgpvpn,
+                    evpn_external_ids=evpn_external_ids)
 
         # Update all associated ports
         for port_id in new_bgpvpn.get('ports', []):
             self.ovn_client.update_port_binding_evpn_config(
-                context, port_id, new_bgpvpn)
+                context, port_id, new_bgpvpn,
+                evpn_external_ids=evpn_external_ids)
 
     def delete_bgpvpn_precommit(self, context, bgpvpn):
         """Remove EVPN configuration from OVN before deletion"""
         LOG.info("Deleting BGPVPN %s, removing EVPN config from OVN",
                  bgpvpn['id'])
 
-        # Remove config from associated networks
-        for network_id in bgpvpn.get('networks', []):
-            self._clear_network_evpn_config(context, network_id)
-
-        # Remove config from router-connected networks
-        for router_id in bgpvpn.get('routers', []):
-            self._clear_router_evpn_config(context, router_id)
+        # Remove config from associated networks and from router-connected
+        # networks, with the ports of all routers fetched in one query
+        network_ids = dict.fromkeys(bgpvpn.get('networks', []))
+        routers_ports = self._get_router_ports_bulk(
+            context, bgpvpn.get('routers', []))
+        for network_id in self._get_router_network_ids(routers_ports):
+            if network_id in network_ids:
+                continue
+            # Only clear if no direct network association exists
+            if not self._network_has_direct_bgpvpn(context, network_id):
+                network_ids[network_id] = None
+
+        if network_ids:
+            # All Logical_Switch removals are committed in one NB
+            # transaction, then the router ports of each network (SB)
+            logical_switches = self._get_logical_switches(context,
+                                                          network_ids)
+            if logical_switches:
+                try:
+                    with self.ovn_client.nb_transaction() as txn:
+                        for network_id, ls in logical_switches.items():
+                            self.ovn_client.clear_logical_switch_evpn_config(
+                                context, network_id, txn=txn, ls=ls)
+                except Exception as e:
+                    LOG.error("Failed to clear EVPN config of BGPVPN %s "
+                              "from networks %s: %s", bgpvpn['id'],
+                              list(logical_switches), e)
+                    raise
+            for network_id in network_ids:
+                self._clear_router_ports_evpn_config(context, network_id)
 
         # Remove config from associated ports
         for port_id in bgpvpn.get('ports', []):
@@ -345,8 +420,8 @@ class OVNBGPVPNDriver(driver_api.BGPVPNDriverRC):
             subnet_id = payload.metadata['subnet_id']
 
             # Get network for this subnet
-            plugin = directory.get_plugin()
-            network_id = plugin.get_subnet(context, subnet_id)['network_id']
+            network_id = self.core_plugin.get_subnet(
+                context, subnet_id, fields=['network_id'])['network_id']
 
             LOG.debug("Router interface deleted: router=%s, network=%s",
                       router_id, network_id)
@@ -365,7 +440,8 @@ class OVNBGPVPNDriver(driver_api.BGPVPNDriverRC):
     # Helper methods for updating OVN
     # =========================================================================
 
-    def _update_network_evpn_config(self, context, network_id, bgpvpn):
+    def _update_network_evpn_config(self, context, network_id, bgpvpn,
+                                    evpn_external_ids=None):
         """Apply EVPN config to network (Logical_Switch + Port_Bindings)
 
         Updates both:
@@ -373,54 +449,61 @@ class OVNBGPVPNDriver(driver_api.BGPVPNDriverRC):
         2. Port_Binding external_ids for router interface ports
            (required by OVN BGP Agent to detect EVPN networks)
         """
+        if evpn_external_ids is None:
+            evpn_external_ids = self.ovn_client.build_evpn_external_ids(
+                bgpvpn)
+
         # Update Logical_Switch
         self.ovn_client.update_logical_switch_evpn_config(
-            context, network_id, bgpvpn)
+            context, network_id, bgpvpn, evpn_external_ids=evpn_external_ids)
 
         # Update Port_Bindings for router interface ports
-        self._update_router_ports_evpn_config(context, network_id, bgpvpn)
+        self._update_router_ports_evpn_config(
+            context, network_id, bgpvpn, evpn_external_ids=evpn_external_ids)
 
     def _clear_network_evpn_config(self, context, network_id):
         """Remove EVPN config from network"""
         self.ovn_client.clear_logical_switch_evpn_config(context, network_id)
         self._clear_router_ports_evpn_config(context, network_id)
 
-    def _update_router_ports_evpn_config(self, context, network_id, bgpvpn):
+    def _update_router_ports_evpn_config(self, context, network_id, bgpvpn,
+                                         evpn_external_ids=None):
         """Update Port_Binding external_ids for router interface ports
 
         The OVN BGP Agent monitors Port_Binding external_ids to detect
         EVPN-enabled networks. We must set neutron_bgpvpn:* fields on
         router interface ports (lrp-*) for the agent to process them.
         """
-        plugin = directory.get_plugin()
-
         # Get router interface ports on this network
         filters = {
             'network_id': [network_id],
             'device_owner': [const.DEVICE_OWNER_ROUTER_INTF]
         }
-        ports = plugin.get_ports(context, filters=filters)
+        ports = self.core_plugin.get_ports(context, filters=filters,
+                                           fields=['id'])
 
         LOG.debug("Updating %d router interface ports on network %s",
                   len(ports), network_id)
 
-        for port in ports:
-            try:
-                self.ovn_client.update_port_binding_evpn_config(
-                    context, port['id'], bgpvpn)
-            except Exception as e:
-                LOG.error("Failed to update Port_Binding for port %s: %s",
-                          port['id'], e)
+        if not ports:
+            return
+
+        try:
+            self.ovn_client.update_port_bindings_evpn_config_bulk(
+                context, [port['id'] for port in ports], bgpvpn,
+                evpn_external_ids=evpn_external_ids)
+        except Exception as e:
+            LOG.error("Failed to update Port_Bindings on network %s: %s",
+                      network_id, e)
 
     def _clear_router_ports_evpn_config(self, context, network_id):
         """Clear EVPN config from router interface ports"""
-        plugin = directory.get_plugin()
-
         filters = {
             'network_id': [network_id],
             'device_owner': [const.DEVICE_OWNER_ROUTER_INTF]
         }
-        ports = plugin.get_ports(context, filters=filters)
+        ports = self.core_plugin.get_ports(context, filters=filters,
+                                           fields=['id'])
 
         LOG.debug("Clearing EVPN config from %d router interface ports",
                   len(ports))
@@ -433,43 +516,90 @@ class OVNBGPVPNDriver(driver_api.BGPVPNDriverRC):
                 LOG.error("Failed to clear Port_Binding for port %s: %s",
                           port['id'], e)
 
-    def _update_router_evpn_config(self, context, router_id, bgpvpn):
+    def _update_router_evpn_config(self, context, router_id, bgpvpn,
+                                   evpn_external_ids=None):
         """Apply EVPN config to all networks connected to router"""
-        l3_plugin = directory.get_plugin(const.L3)
-        router = l3_plugin.get_router(context, router_id)
+        # Raises RouterNotFound if the router is gone
+        self.l3_plugin.get_router(context, router_id)
 
         # Get all networks connected to this router
-        plugin = directory.get_plugin()
-        filters = {
-            'device_id': [router_id],
-            'device_owner': [const.DEVICE_OWNER_ROUTER_INTF]
-        }
-        router_ports = plugin.get_ports(context, filters=filters)
+        network_ids = self._get_router_network_ids(
+            self._get_router_ports_bulk(context, [router_id]))
 
         LOG.debug("Updating EVPN config for %d networks via router %s",
-                  len(router_ports), router_id)
+                  len(network_ids), router_id)
 
-        for port in router_ports:
-            network_id = port['network_id']
-            self._update_network_evpn_config(context, network_id, bgpvpn)
+        if evpn_external_ids is None:
+            evpn_external_ids = self.ovn_client.build_evpn_external_ids(
+                bgpvpn)
+
+        for network_id in network_ids:
+            self._update_network_evpn_config(
+                context, network_id, bgpvpn,
+                evpn_external_ids=evpn_external_ids)
 
     def _clear_router_evpn_config(self, context, router_id):
         """Remove EVPN config from router-connected networks"""
-        plugin = directory.get_plugin()
-        filters = {
-            'device_id': [router_id],
-            'device_owner': [const.DEVICE_OWNER_ROUTER_INTF]
-        }
-        router_ports = plugin.get_ports(context, filters=filters)
+        network_ids = self._get_router_network_ids(
+            self._get_router_ports_bulk(context, [router_id]))
 
-        LOG.debug("Clearing EVPN config from %d networks", len(router_ports))
+        LOG.debug("Clearing EVPN config from %d networks", len(network_ids))
 
-        for port in router_ports:
-            network_id = port['network_id']
+        for network_id in network_ids:
             # Only clear if no direct network association exists
             if not self._network_has_direct_bgpvpn(context, network_id):
                 self._clear_network_evpn_config(context, network_id)
 
+    def _get_logical_switches(self, context, network_ids):
+        """Get the Logical_Switches of networks, warning about missing ones
+
+        Networks without a Logical_Switch get no Logical_Switch update, but
+        the Port_Bindings of their router interface ports are still handled.
+        """
+        logical_switches = self.ovn_client.get_logical_switches(
+            context, network_ids)
+        for network_id in network_ids:
+            if network_id not in logical_switches:
+                LOG.warning("Logical_Switch not found for network %s, "
+                            "only handling its router interface ports",
+                            network_id)
+        return logical_switches
+
+    def _get_router_ports_bulk(self, context, router_ids):
+        """Get the router interface ports of several routers in one query
+
+        Returns:
+            dict: router_id -> list of router interface ports, with only
+                their device_id and network_id
+        """
+        routers_ports = {router_id: [] for router_id in router_ids}
+        if not routers_ports:
+            return routers_ports
+
+        filters = {
+            'device_id': list(routers_ports),
+            'device_owner': [const.DEVICE_OWNER_ROUTER_INTF]
+        }
+        ports = self.core_plugin.get_ports(
+            context, filters=filters, fields=['device_id', 'network_id'])
+        for port in ports:
+            routers_ports[port['device_id']].append(port)
+        return routers_ports
+
+    @staticmethod
+    def _get_router_network_ids(routers_ports):
+        """Get the networks of router interface ports, without duplicates
+
+        Args:
+            routers_ports: dict from _get_router_ports_bulk()
+
+        Returns:
+            dict: network IDs (as keys), in port order
+        """
+        return dict.fromkeys(port['network_id']
+                             for router_ports in routers_ports.values()
+                             for port in router_ports)
+
     # =========================================================================
     # Helper methods for BGPVPN lookups
     # =========================================================================
@@ -492,18 +622,19 @@ class OVNBGPVPNDriver(driver_api.BGPVPNDriverRC):
 
     def _network_has_router_bgpvpn(self, context, network_id):
         """Check if network is connected to a router with BGPVPN"""
-        plugin = directory.get_plugin()
         filters = {
             'network_id': [network_id],
             'device_owner': [const.DEVICE_OWNER_ROUTER_INTF]
         }
-        router_ports = plugin.get_ports(context, filters=filters)
-
-        for port in router_ports:
-            router_id = port['device_id']
-            if self._get_router_bgpvpn(context, router_id):
-                return True
-        return False
+        router_ports = self.core_plugin.get_ports(
+            context, filters=filters, fields=['device_id'])
+
+        # One query for the BGPVPNs of all routers on the network
+        router_ids = list(dict.fromkeys(
+            port['device_id'] for port in router_ports))
+        if not router_ids:
+            return False
+        return bool(self.get_bgpvpns(context, filters={'routers': router_ids}))
 
     def _network_has_bgpvpn(self, context, network_id):
         """Check if network has any BGPVPN (direct or via router)"""
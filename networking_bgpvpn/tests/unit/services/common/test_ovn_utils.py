@@ -0,0 +1,42 @@
+# Copyright (c) 2024 OpenStack Foundation.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from neutron.tests import base
+
+from networking_bgpvpn.neutron.services.common import ovn_utils
+
+
+class TestOVNUtils(base.BaseTestCase):
+
+    def test_verify_ovn_bgp_agent_compatibility(self):
+        with mock.patch.object(ovn_utils, '_compatibility_logged', False), \
+                mock.patch.object(ovn_utils, 'LOG') as mock_log:
+            for _ in range(2):
+                self.assertEqual(
+                    (True, ovn_utils.get_recommended_agent_config()),
+                    ovn_utils.verify_ovn_bgp_agent_compatibility())
+        mock_log.info.assert_called_once()
+
+    def test_get_recommended_agent_config(self):
+        self.assertIn('driver = ovn_evpn_driver',
+                      ovn_utils.get_recommended_agent_config())
+
+    def test_get_evpn_external_ids_keys(self):
+        keys = ovn_utils.get_evpn_external_ids_keys()
+        self.assertIsInstance(keys, tuple)
+        self.assertEqual('neutron_bgpvpn:type', keys[0])
+        self.assertEqual(ovn_utils.EVPN_EXTERNAL_IDS_KEYS, frozenset(keys))
@@ -0,0 +1,295 @@
+# Copyright (c) 2024 OpenStack Foundation.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from neutron.plugins.ml2.drivers.ovn.mech_driver import mech_driver
+from neutron.tests import base
+
+from networking_bgpvpn.neutron.services.service_drivers.ovn import ovn_client
+
+
+class TestOVNClient(base.BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.nb_idl = mock.MagicMock()
+        self.sb_idl = mock.MagicMock()
+        self.ovn_driver = mock.Mock(spec=mech_driver.OVNMechanismDriver,
+                                    nb_ovn=self.nb_idl, sb_ovn=self.sb_idl)
+        self.plugin = mock.Mock()
+        self.plugin.mechanism_manager.mech_drivers = {
+            'openvswitch': mock.Mock(obj=mock.Mock(spec=[])),
+            'ovn': mock.Mock(obj=self.ovn_driver),
+        }
+        mock.patch.object(ovn_client.directory, 'get_plugin',
+                          return_value=self.plugin).start()
+        self.addCleanup(mock.patch.stopall)
+        self.client = ovn_client.OVNClient()
+
+    def test_nb_idl_resolves_ovn_driver(self):
+        self.assertIs(self.nb_idl, self.client._nb_idl)
+        self.assertIs(self.sb_idl, self.client._sb_idl)
+
+    def test_resolve_ovn_driver_cached_per_client(self):
+        self.assertIs(self.nb_idl, self.client._nb_idl)
+        self.plugin.mechanism_manager.mech_drivers = {}
+        self.assertIs(self.nb_idl, self.client._nb_idl)
+        self.assertIs(self.sb_idl, self.client._sb_idl)
+
+    def test_resolve_ovn_driver_not_found(self):
+        self.plugin.mechanism_manager.mech_drivers = {
+            'openvswitch': mock.Mock(obj=mock.Mock(spec=[])),
+        }
+        self.assertRaises(RuntimeError, getattr, self.client, '_nb_idl')
+
+    def test_resolve_ovn_driver_not_initialized(self):
+        self.ovn_driver.nb_ovn = None
+        self.assertRaises(RuntimeError, getattr, self.client, '_nb_idl')
+        # not cached, resolved again once the IDLs are initialized
+        self.ovn_driver.nb_ovn = self.nb_idl
+        self.assertIs(self.nb_idl, self.client._nb_idl)
+
+    def test_get_port_binding(self):
+        pb = mock.Mock(logical_port='lrp-port-id')
+        self.sb_idl.db_find_rows.return_value.execute.return_value = [pb]
+        self.assertIs(pb, self.client._get_port_binding(None, 'port-id'))
+        self.sb_idl.db_find_rows.assert_called_once_with(
+            'Port_Binding', ('logical_port', '=', 'lrp-port-id'))
+
+    def test_get_port_binding_not_found(self):
+        self.sb_idl.db_find_rows.return_value.execute.return_value = []
+        self.assertIsNone(self.client._get_port_binding(None, 'port-id'))
+
+    def test_get_port_binding_idl_error(self):
+        self.sb_idl.db_find_rows.return_value.execute.side_effect = (
+            RuntimeError)
+        self.assertRaises(RuntimeError, self.client._get_port_binding,
+                          None, 'port-id')
+
+    def _bgpvpn(self, **kwargs):
+        bgpvpn = {'id': 'bgpvpn-id', 'type': 'l3', 'vni': 1000,
+                  'route_targets': ['64512:1']}
+        bgpvpn.update(kwargs)
+        return bgpvpn
+
+    def test_update_logical_switch_evpn_config(self):
+        ls = mock.Mock(uuid='ls-uuid', external_ids={})
+        self.nb_idl.lookup.return_value = ls
+        bgpvpn = self._bgpvpn()
+        self.client.update_logical_switch_evpn_config(None, 'net-id', bgpvpn)
+        self.nb_idl.db_set.assert_called_once_with(
+            'Logical_Switch', 'ls-uuid',
+            ('external_ids', self.client.build_evpn_external_ids(bgpvpn)))
+
+    def test_update_port_binding_evpn_config(self):
+        pb = mock.Mock(uuid='pb-uuid', external_ids={})
+        self.sb_idl.db_find_rows.return_value.execute.return_value = [pb]
+        bgpvpn = self._bgpvpn()
+        self.client.update_port_binding_evpn_config(None, 'port-id', bgpvpn)
+        self.sb_idl.db_set.assert_called_once_with(
+            'Port_Binding', 'pb-uuid',
+            ('external_ids', self.client.build_evpn_external_ids(bgpvpn)))
+
+    def test_clear_logical_switch_evpn_config(self):
+        ls = mock.Mock(uuid='ls-uuid', external_ids={
+            'neutron_bgpvpn:vni': '1000', 'neutron_bgpvpn:type': 'l3',
+            'neutron:network_name': 'net'})
+        self.nb_idl.lookup.return_value = ls
+        self.client.clear_logical_switch_evpn_config(None, 'net-id')
+        self.nb_idl.db_remove.assert_called_once_with(
+            'Logical_Switch', 'ls-uuid', 'external_ids',
+            'neutron_bgpvpn:type', 'neutron_bgpvpn:vni', if_exists=True)
+
+    def test_clear_logical_switch_evpn_config_nothing_set(self):
+        ls = mock.Mock(uuid='ls-uuid',
+                       external_ids={'neutron:network_name': 'net'})
+        self.nb_idl.lookup.return_value = ls
+        self.client.clear_logical_switch_evpn_config(None, 'net-id')
+        self.nb_idl.transaction.assert_not_called()
+        self.nb_idl.db_remove.assert_not_called()
+
+    def test_clear_port_binding_evpn_config(self):
+        pb = mock.Mock(uuid='pb-uuid',
+                       external_ids={'neutron_bgpvpn:vni': '1000'})
+        self.sb_idl.db_find_rows.return_value.execute.return_value = [pb]
+        self.client.clear_port_binding_evpn_config(None, 'port-id')
+        self.sb_idl.db_remove.assert_called_once_with(
+            'Port_Binding', 'pb-uuid', 'external_ids',
+            'neutron_bgpvpn:vni', if_exists=True)
+
+    def test_encode_rtrd_list_matches_json(self):
+        self.assertEqual('[]', ovn_client._encode_rtrd_list([]))
+        self.assertEqual('["64512:1"]',
+                         ovn_client._encode_rtrd_list(['64512:1']))
+        self.assertEqual('["64512:1", "192.0.2.1:10"]',
+                         ovn_client._encode_rtrd_list(['64512:1',
+                                                       '192.0.2.1:10']))
+
+    def test_get_logical_switch_evpn_config(self):
+        bgpvpn = self._bgpvpn(import_targets=['64512:2', '64512:3'],
+                              route_distinguishers=['64512:100'],
+                              local_pref=100)
+        ls = mock.Mock(
+            external_ids=self.client.build_evpn_external_ids(bgpvpn))
+        self.nb_idl.lookup.return_value = ls
+        self.assertEqual(
+            {'type': 'l3', 'vni': 1000, 'bgp_as': '64512',
+             'route_targets': ['64512:1'],
+             'import_targets': ['64512:2', '64512:3'],
+             'route_distinguishers': ['64512:100'],
+             'local_pref': 100},
+            self.client.get_logical_switch_evpn_config(None, 'net-id'))
+
+    def test_update_port_bindings_evpn_config_bulk(self):
+        pb1 = mock.Mock(uuid='pb1-uuid', external_ids={})
+        pb2 = mock.Mock(uuid='pb2-uuid', external_ids={})
+        self.sb_idl.db_find_rows.return_value.execute.side_effect = [
+            [pb1], [], [pb2]]
+        bgpvpn = self._bgpvpn()
+        self.client.update_port_bindings_evpn_config_bulk(
+            None, ['port1', 'port2', 'port3'], bgpvpn)
+        evpn_external_ids = self.client.build_evpn_external_ids(bgpvpn)
+        self.sb_idl.transaction.assert_called_once_with(check_error=True)
+        self.sb_idl.db_set.assert_has_calls([
+            mock.call('Port_Binding', 'pb1-uuid',
+                      ('external_ids', evpn_external_ids)),
+            mock.call('Port_Binding', 'pb2-uuid',
+                      ('external_ids', evpn_external_ids))])
+        self.assertEqual(2, self.sb_idl.db_set.call_count)
+
+    def test_update_port_bindings_evpn_config_bulk_lookup_error(self):
+        pb2 = mock.Mock(uuid='pb2-uuid', external_ids={})
+        self.sb_idl.db_find_rows.return_value.execute.side_effect = [
+            RuntimeError, [pb2]]
+        bgpvpn = self._bgpvpn()
+        self.client.update_port_bindings_evpn_config_bulk(
+            None, ['port1', 'port2'], bgpvpn)
+        self.sb_idl.db_set.assert_called_once_with(
+            'Port_Binding', 'pb2-uuid',
+            ('external_ids', self.client.build_evpn_external_ids(bgpvpn)))
+
+    def test_update_logical_switch_evpn_config_precomputed(self):
+        ls = mock.Mock(uuid='ls-uuid', external_ids={})
+        self.nb_idl.lookup.return_value = ls
+        evpn_external_ids = {'neutron_bgpvpn:vni': '1000'}
+        with mock.patch.object(self.client,
+                               'build_evpn_external_ids') as build:
+            self.client.update_logical_switch_evpn_config(
+                None, 'net-id', self._bgpvpn(),
+                evpn_external_ids=evpn_external_ids)
+        build.assert_not_called()
+        self.nb_idl.db_set.assert_called_once_with(
+            'Logical_Switch', 'ls-uuid', ('external_ids', evpn_external_ids))
+
+    def test_update_logical_switch_evpn_config_unchanged(self):
+        bgpvpn = self._bgpvpn()
+        ls = mock.Mock(
+            uuid='ls-uuid',
+            external_ids=self.client.build_evpn_external_ids(bgpvpn))
+        self.nb_idl.lookup.return_value = ls
+        self.client.update_logical_switch_evpn_config(None, 'net-id', bgpvpn)
+        self.nb_idl.transaction.assert_not_called()
+        self.nb_idl.db_set.assert_not_called()
+
+    def test_update_logical_switch_evpn_config_changed_keys_only(self):
+        ls = mock.Mock(
+            uuid='ls-uuid',
+            external_ids=self.client.build_evpn_external_ids(
+                self._bgpvpn()))
+        self.nb_idl.lookup.return_value = ls
+        self.client.update_logical_switch_evpn_config(
+            None, 'net-id', self._bgpvpn(local_pref=200))
+        self.nb_idl.db_set.assert_called_once_with(
+            'Logical_Switch', 'ls-uuid',
+            ('external_ids', {'neutron_bgpvpn:local_pref': '200'}))
+
+    def test_get_logical_switch_not_found(self):
+        self.nb_idl.lookup.return_value = None
+        self.assertIsNone(self.client._get_logical_switch(None, 'net-id'))
+        self.nb_idl.lookup.assert_called_once_with(
+            'Logical_Switch', 'neutron-net-id', default=None)
+
+    def test_get_logical_switch_idl_error(self):
+        self.nb_idl.lookup.side_effect = RuntimeError
+        self.assertRaises(RuntimeError, self.client._get_logical_switch,
+                          None, 'net-id')
+
+    def test_get_logical_switches(self):
+        ls = mock.Mock(uuid='ls-uuid')
+        self.nb_idl.lookup.side_effect = [ls, None]
+        self.assertEqual({'net1': ls},
+                         self.client.get_logical_switches(
+                             None, ['net1', 'net2']))
+        self.nb_idl.lookup.assert_has_calls([
+            mock.call('Logical_Switch', 'neutron-net1', default=None),
+            mock.call('Logical_Switch', 'neutron-net2', default=None)])
+
+    def test_update_port_binding_evpn_config_unchanged(self):
+        bgpvpn = self._bgpvpn()
+        pb = mock.Mock(
+            uuid='pb-uuid',
+            external_ids=self.client.build_evpn_external_ids(bgpvpn))
+        self.sb_idl.db_find_rows.return_value.execute.return_value = [pb]
+        self.client.update_port_binding_evpn_config(None, 'port-id', bgpvpn)
+        self.sb_idl.transaction.assert_not_called()
+        self.sb_idl.db_set.assert_not_called()
+
+    def test_update_port_bindings_evpn_config_bulk_changed_only(self):
+        bgpvpn = self._bgpvpn()
+        evpn_external_ids = self.client.build_evpn_external_ids(bgpvpn)
+        pb1 = mock.Mock(uuid='pb1-uuid', external_ids=evpn_external_ids)
+        pb2 = mock.Mock(uuid='pb2-uuid',
+                        external_ids=dict(evpn_external_ids,
+                                          **{'neutron_bgpvpn:vni': '1'}))
+        self.sb_idl.db_find_rows.return_value.execute.side_effect = [
+            [pb1], [pb2]]
+        self.client.update_port_bindings_evpn_config_bulk(
+            None, ['port1', 'port2'], bgpvpn)
+        self.sb_idl.db_set.assert_called_once_with(
+            'Port_Binding', 'pb2-uuid',
+            ('external_ids', {'neutron_bgpvpn:vni': '1000'}))
+
+    def test_update_logical_switch_evpn_config_in_txn(self):
+        ls = mock.Mock(uuid='ls-uuid', external_ids={})
+        self.nb_idl.lookup.return_value = ls
+        txn = mock.Mock()
+        self.client.update_logical_switch_evpn_config(
+            None, 'net-id', self._bgpvpn(), txn=txn)
+        self.nb_idl.transaction.assert_not_called()
+        txn.add.assert_called_once_with(self.nb_idl.db_set.return_value)
+
+    def test_clear_logical_switch_evpn_config_in_txn(self):
+        ls = mock.Mock(uuid='ls-uuid',
+                       external_ids={'neutron_bgpvpn:vni': '1000'})
+        self.nb_idl.lookup.return_value = ls
+        txn = mock.Mock()
+        self.client.clear_logical_switch_evpn_config(None, 'net-id', txn=txn)
+        self.nb_idl.transaction.assert_not_called()
+        txn.add.assert_called_once_with(self.nb_idl.db_remove.return_value)
+
+    def test_update_logical_switch_evpn_config_given_ls(self):
+        ls = mock.Mock(uuid='ls-uuid', external_ids={})
+        self.client.update_logical_switch_evpn_config(
+            None, 'net-id', self._bgpvpn(), ls=ls)
+        self.nb_idl.lookup.assert_not_called()
+        self.nb_idl.db_set.assert_called_once()
+
+    def test_clear_logical_switch_evpn_config_given_ls(self):
+        ls = mock.Mock(uuid='ls-uuid',
+                       external_ids={'neutron_bgpvpn:vni': '1000'})
+        self.client.clear_logical_switch_evpn_config(None, 'net-id', ls=ls)
+        self.nb_idl.lookup.assert_not_called()
+        self.nb_idl.db_remove.assert_called_once()
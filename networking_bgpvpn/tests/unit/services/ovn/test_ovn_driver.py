@@ -0,0 +1,283 @@
+# Copyright (c) 2024 OpenStack Foundation.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from neutron.tests import base
+
+from neutron_lib import constants as const
+from neutron_lib.plugins import constants as plugin_constants
+
+from networking_bgpvpn.neutron.services.service_drivers import driver_api
+from networking_bgpvpn.neutron.services.service_drivers.ovn import ovn_driver
+
+
+class TestOVNBGPVPNDriver(base.BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.core_plugin = mock.Mock()
+        self.l3_plugin = mock.Mock()
+        plugins = {plugin_constants.L3: self.l3_plugin}
+        self.get_plugin = mock.patch.object(
+            ovn_driver.directory, 'get_plugin',
+            side_effect=lambda alias=None: plugins.get(
+                alias, self.core_plugin)).start()
+        mock.patch.object(driver_api.bgpvpn_db, 'BGPVPNPluginDb').start()
+        self.addCleanup(mock.patch.stopall)
+
+        self.driver = ovn_driver.OVNBGPVPNDriver(mock.Mock())
+        self.ovn_client = self.driver._ovn_client = mock.MagicMock()
+        self.context = mock.Mock()
+
+    @staticmethod
+    def _router_port(router_id, network_id):
+        return {'id': 'port-%s-%s' % (router_id, network_id),
+                'device_id': router_id,
+                'network_id': network_id}
+
+    def _bgpvpn(self, **kwargs):
+        bgpvpn = {'id': 'bgpvpn-id', 'type': 'l3', 'vni': 1000,
+                  'route_targets': ['64512:1'],
+                  'networks': [], 'routers': [], 'ports': []}
+        bgpvpn.update(kwargs)
+        return bgpvpn
+
+    def test_get_router_ports_bulk(self):
+        self.core_plugin.get_ports.return_value = [
+            self._router_port('r1', 'net1'),
+            self._router_port('r2', 'net2'),
+            self._router_port('r1', 'net3')]
+        routers_ports = self.driver._get_router_ports_bulk(
+            self.context, ['r1', 'r2', 'r3'])
+        self.core_plugin.get_ports.assert_called_once_with(
+            self.context,
+            filters={'device_id': ['r1', 'r2', 'r3'],
+                     'device_owner': [const.DEVICE_OWNER_ROUTER_INTF]},
+            fields=['device_id', 'network_id'])
+        self.assertEqual(['net1', 'net3'],
+                         [p['network_id'] for p in routers_ports['r1']])
+        self.assertEqual(['net2'],
+                         [p['network_id'] for p in routers_ports['r2']])
+        self.assertEqual([], routers_ports['r3'])
+
+    def test_plugins_looked_up_once(self):
+        self.assertIs(self.core_plugin, self.driver.core_plugin)
+        self.assertIs(self.core_plugin, self.driver.core_plugin)
+        self.assertIs(self.l3_plugin, self.driver.l3_plugin)
+        self.assertIs(self.l3_plugin, self.driver.l3_plugin)
+        self.assertEqual([mock.call(), mock.call(plugin_constants.L3)],
+                         self.get_plugin.call_args_list)
+
+    def test_create_bgpvpn_precommit(self):
+        self.driver.create_bgpvpn_precommit(self.context, self._bgpvpn())
+        self.driver.create_bgpvpn_precommit(self.context,
+                                            self._bgpvpn(type='l2'))
+
+    def test_create_bgpvpn_precommit_type_not_supported(self):
+        self.assertRaises(ovn_driver.bgpvpn_ext.BGPVPNTypeNotSupported,
+                          self.driver.create_bgpvpn_precommit,
+                          self.context, self._bgpvpn(type='l4'))
+
+    def test_create_bgpvpn_precommit_vni_required(self):
+        self.assertRaises(ovn_driver.bgpvpn_ext.BGPVPNDriverError,
+                          self.driver.create_bgpvpn_precommit,
+                          self.context, self._bgpvpn(vni=None))
+
+    def test_get_router_ports_bulk_no_router(self):
+        self.assertEqual({},
+                         self.driver._get_router_ports_bulk(self.context, []))
+        self.core_plugin.get_ports.assert_not_called()
+
+    def test_update_bgpvpn_postcommit_updates_each_network_once(self):
+        self.core_plugin.get_ports.side_effect = [
+            # routers' interfaces
+            [self._router_port('r1', 'net1'),
+             self._router_port('r1', 'net2'),
+             self._router_port('r2', 'net2')],
+            # router interfaces on each updated network
+            [], [], []]
+        self.ovn_client.get_logical_switches.return_value = {
+            'net1': mock.Mock(), 'net3': mock.Mock(), 'net2': mock.Mock()}
+        old_bgpvpn = self._bgpvpn(networks=['net1', 'net3'],
+                                  routers=['r1', 'r2'])
+        new_bgpvpn = dict(old_bgpvpn, route_targets=['64512:2'])
+        self.driver.update_bgpvpn_postcommit(self.context, old_bgpvpn,
+                                             new_bgpvpn)
+        self.assertEqual(
+            ['net1', 'net3', 'net2'],
+            [c[0][1] for c in self.ovn_client.
+             update_logical_switch_evpn_config.call_args_list])
+        self.ovn_client.build_evpn_external_ids.assert_called_once_with(
+            new_bgpvpn)
+        # in a single NB transaction
+        self.ovn_client.nb_transaction.assert_called_once_with()
+        nb_transaction = self.ovn_client.nb_transaction.return_value
+        txn = nb_transaction.__enter__.return_value
+        for call in (self.ovn_client.
+                     update_logical_switch_evpn_config.call_args_list):
+            self.assertIs(txn, call[1]['txn'])
+
+    def test_update_bgpvpn_postcommit_missing_logical_switch(self):
+        self.core_plugin.get_ports.return_value = []
+        ls = mock.Mock()
+        self.ovn_client.get_logical_switches.return_value = {'net2': ls}
+        old_bgpvpn = self._bgpvpn(networks=['net1', 'net2'])
+        new_bgpvpn = dict(old_bgpvpn, route_targets=['64512:2'])
+        with mock.patch.object(self.driver,
+                               '_update_router_ports_evpn_config') as update:
+            self.driver.update_bgpvpn_postcommit(self.context, old_bgpvpn,
+                                                 new_bgpvpn)
+        # router interface ports are updated even without a Logical_Switch,
+        # as on delete
+        self.assertEqual(
+            [mock.call(self.context, 'net1', new_bgpvpn,
+                       evpn_external_ids=mock.ANY),
+             mock.call(self.context, 'net2', new_bgpvpn,
+                       evpn_external_ids=mock.ANY)],
+            update.call_args_list)
+        self.ovn_client.get_logical_switches.assert_called_once_with(
+            self.context, {'net1': None, 'net2': None})
+        self.ovn_client.update_logical_switch_evpn_config.\
+            assert_called_once_with(self.context, 'net2', new_bgpvpn,
+                                    evpn_external_ids=mock.ANY, txn=mock.ANY,
+                                    ls=ls)
+
+    def test_update_bgpvpn_postcommit_nb_commit_error(self):
+        self.core_plugin.get_ports.return_value = []
+        self.ovn_client.get_logical_switches.return_value = {
+            'net1': mock.Mock()}
+        self.ovn_client.nb_transaction.return_value.__exit__.side_effect = (
+            RuntimeError)
+        old_bgpvpn = self._bgpvpn(networks=['net1'])
+        new_bgpvpn = dict(old_bgpvpn, route_targets=['64512:2'])
+        with mock.patch.object(ovn_driver.LOG, 'error') as log_error:
+            self.assertRaises(RuntimeError,
+                              self.driver.update_bgpvpn_postcommit,
+                              self.context, old_bgpvpn, new_bgpvpn)
+        log_error.assert_called_once_with(mock.ANY, 'bgpvpn-id', ['net1'],
+                                          mock.ANY)
+
+    def test_update_bgpvpn_postcommit_no_relevant_change(self):
+        old_bgpvpn = self._bgpvpn(networks=['net1'], routers=['r1'])
+        new_bgpvpn = dict(old_bgpvpn, name='new-name',
+                          description='new description')
+        self.driver.update_bgpvpn_postcommit(self.context, old_bgpvpn,
+                                             new_bgpvpn)
+        self.core_plugin.get_ports.assert_not_called()
+        self.ovn_client.nb_transaction.assert_not_called()
+
+    def test_update_bgpvpn_postcommit_no_network(self):
+        old_bgpvpn = self._bgpvpn(ports=['port1'])
+        new_bgpvpn = dict(old_bgpvpn, route_targets=['64512:2'])
+        self.driver.update_bgpvpn_postcommit(self.context, old_bgpvpn,
+                                             new_bgpvpn)
+        self.ovn_client.get_logical_switches.assert_not_called()
+        self.ovn_client.nb_transaction.assert_not_called()
+        self.ovn_client.update_port_binding_evpn_config.\
+            assert_called_once_with(self.context, 'port1', new_bgpvpn,
+                                    evpn_external_ids=mock.ANY)
+
+    def test_delete_bgpvpn_precommit(self):
+        self.core_plugin.get_ports.return_value = [
+            self._router_port('r1', 'net1'),
+            self._router_port('r1', 'net2')]
+        ls1, ls2 = mock.Mock(), mock.Mock()
+        self.ovn_client.get_logical_switches.return_value = {
+            'net1': ls1, 'net2': ls2}
+        txn_cm = self.ovn_client.nb_transaction.return_value
+
+        def has_direct_bgpvpn(context, network_id):
+            # DB queries are done before the NB transaction is opened
+            txn_cm.__enter__.assert_not_called()
+            return False
+
+        with mock.patch.object(self.driver, '_network_has_direct_bgpvpn',
+                               side_effect=has_direct_bgpvpn), \
+                mock.patch.object(self.driver,
+                                  '_clear_router_ports_evpn_config') as clear:
+            self.driver.delete_bgpvpn_precommit(
+                self.context, self._bgpvpn(networks=['net1'],
+                                           routers=['r1']))
+        txn = txn_cm.__enter__.return_value
+        self.assertEqual(
+            [mock.call(self.context, 'net1', txn=txn, ls=ls1),
+             mock.call(self.context, 'net2', txn=txn, ls=ls2)],
+            self.ovn_client.clear_logical_switch_evpn_config.call_args_list)
+        self.assertEqual([mock.call(self.context, 'net1'),
+                          mock.call(self.context, 'net2')],
+                         clear.call_args_list)
+
+    def test_delete_bgpvpn_precommit_nb_commit_error(self):
+        self.ovn_client.get_logical_switches.return_value = {
+            'net1': mock.Mock()}
+        self.ovn_client.nb_transaction.return_value.__exit__.side_effect = (
+            RuntimeError)
+        with mock.patch.object(ovn_driver.LOG, 'error') as log_error, \
+                mock.patch.object(self.driver,
+                                  '_clear_router_ports_evpn_config') as clear:
+            self.assertRaises(RuntimeError,
+                              self.driver.delete_bgpvpn_precommit,
+                              self.context, self._bgpvpn(networks=['net1']))
+        log_error.assert_called_once_with(mock.ANY, 'bgpvpn-id', ['net1'],
+                                          mock.ANY)
+        clear.assert_not_called()
+
+    def test_delete_bgpvpn_precommit_no_logical_switch(self):
+        self.ovn_client.get_logical_switches.return_value = {}
+        with mock.patch.object(self.driver,
+                               '_clear_router_ports_evpn_config') as clear:
+            self.driver.delete_bgpvpn_precommit(
+                self.context, self._bgpvpn(networks=['net1']))
+        self.ovn_client.nb_transaction.assert_not_called()
+        clear.assert_called_once_with(self.context, 'net1')
+
+    def test_update_bgpvpn_postcommit_no_logical_switch(self):
+        self.core_plugin.get_ports.return_value = []
+        self.ovn_client.get_logical_switches.return_value = {}
+        old_bgpvpn = self._bgpvpn(networks=['net1'])
+        new_bgpvpn = dict(old_bgpvpn, route_targets=['64512:2'])
+        with mock.patch.object(self.driver,
+                               '_update_router_ports_evpn_config') as update:
+            self.driver.update_bgpvpn_postcommit(self.context, old_bgpvpn,
+                                                 new_bgpvpn)
+        self.ovn_client.nb_transaction.assert_not_called()
+        update.assert_called_once_with(self.context, 'net1', new_bgpvpn,
+                                       evpn_external_ids=mock.ANY)
+
+    def test_delete_bgpvpn_precommit_no_network(self):
+        self.driver.delete_bgpvpn_precommit(self.context, self._bgpvpn())
+        self.core_plugin.get_ports.assert_not_called()
+        self.ovn_client.nb_transaction.assert_not_called()
+
+    def test_network_has_router_bgpvpn_single_query(self):
+        self.core_plugin.get_ports.return_value = [
+            self._router_port('r1', 'net1'),
+            self._router_port('r2', 'net1'),
+            self._router_port('r1', 'net1')]
+        with mock.patch.object(self.driver, 'get_bgpvpns',
+                               return_value=[self._bgpvpn()]) as get_bgpvpns:
+            self.assertTrue(self.driver._network_has_router_bgpvpn(
+                self.context, 'net1'))
+        get_bgpvpns.assert_called_once_with(
+            self.context, filters={'routers': ['r1', 'r2']})
+        self.core_plugin.get_ports.assert_called_once()
+
+    def test_network_has_router_bgpvpn_no_router(self):
+        self.core_plugin.get_ports.return_value = []
+        with mock.patch.object(self.driver, 'get_bgpvpns') as get_bgpvpns:
+            self.assertFalse(self.driver._network_has_router_bgpvpn(
+                self.context, 'net1'))
+        get_bgpvpns.assert_not_called()